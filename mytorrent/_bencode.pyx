@@ -0,0 +1,163 @@
+# cython: language_level=3, boundscheck=False
+"""
+Compiled version of the bencode decoding loop, used by `bencoding.Decoder`
+when it has been built (see `make build-ext`).
+
+It follows the same rules as the pure python decoder: strings are returned as
+`memoryview` slices of the data, except dict keys which are returned as
+`bytes`, and dicts are decoded into built-in dicts.
+"""
+from cpython.bytes cimport (
+    PyBytes_AS_STRING,
+    PyBytes_FromStringAndSize,
+    PyBytes_GET_SIZE,
+)
+from libc.string cimport memchr
+
+
+cdef class CDecoder:
+    """
+    Decodes a bencoded sequence of bytes, starting at `index`.
+    """
+    cdef bytes _data
+    cdef object _view
+    cdef const char *_buf
+    cdef Py_ssize_t _length
+    cdef public Py_ssize_t index
+
+    def __init__(self, bytes data not None, Py_ssize_t index=0):
+        self._data = data
+        self._view = memoryview(data)
+        self._buf = PyBytes_AS_STRING(data)
+        self._length = PyBytes_GET_SIZE(data)
+        self.index = index
+
+    def decode(self):
+        """
+        Decodes the bencoded data and return the matching python object.
+
+        :return A python object representing the bencoded data
+        """
+        # Kept inline rather than using bencoding._ValueBuilder, which would
+        # mean a python method call for every value
+        cdef list stack = []
+        cdef list keys = []
+        cdef char c
+        cdef bint key_expected
+        cdef object obj, container
+        while True:
+            if self.index >= self._length:
+                raise EOFError('Unexpected end-of-file')
+            c = self._buf[self.index]
+            if c == b'i':
+                self.index += 1  # The token
+                obj = self._decode_int()
+            elif b'0' <= c <= b'9':
+                # Keys must be hashable, so they are decoded as bytes
+                key_expected = (stack and type(stack[-1]) is dict
+                                and keys[-1] is None)
+                obj = self._decode_string(key_expected)
+            elif c == b'l':
+                self.index += 1  # The token
+                stack.append([])
+                keys.append(None)
+                continue
+            elif c == b'd':
+                self.index += 1  # The token
+                stack.append({})
+                keys.append(None)
+                continue
+            elif c == b'e':
+                if not stack:
+                    return None
+                if keys[-1] is not None:
+                    raise EOFError('Unexpected end of dict, missing value '
+                                   'for key {0}'.format(str(keys[-1])))
+                self.index += 1  # The END token
+                obj = stack.pop()
+                keys.pop()
+            else:
+                raise RuntimeError('Invalid token read at {0}'.format(
+                    str(self.index)))
+
+            if not stack:
+                return obj
+            container = stack[-1]
+            if type(container) is list:
+                (<list>container).append(obj)
+            elif keys[-1] is None:
+                if type(obj) is not bytes:
+                    raise RuntimeError('Invalid dict key of type {0}'.format(
+                        str(type(obj))))
+                keys[-1] = obj
+            else:
+                (<dict>container)[keys[-1]] = obj
+                keys[-1] = None
+
+    cdef Py_ssize_t _find(self, char token) except -1:
+        """
+        Return the position of the next `token` from the current index
+        """
+        cdef const char *found = <const char *>memchr(
+            self._buf + self.index, token, self._length - self.index)
+        if found == NULL:
+            raise RuntimeError('Unable to find token {0}'.format(
+                str(bytes([token]))))
+        return found - self._buf
+
+    cdef object _decode_int(self):
+        cdef Py_ssize_t end = self._find(b'e')
+        cdef Py_ssize_t i = self.index
+        cdef bint negative = self._buf[i] == b'-'
+        cdef long long value = 0
+        cdef Py_ssize_t digits_start
+        cdef char c
+        if negative:
+            i += 1
+        digits_start = i
+        # Integers that fit in a long long are parsed here, anything else
+        # (too long, no digits or not plain digits) is left to python's int()
+        if 0 < end - i <= 18:
+            while i < end:
+                c = self._buf[i]
+                if not b'0' <= c <= b'9':
+                    break
+                value = value * 10 + (c - 48)
+                i += 1
+        if i != end or i == digits_start:
+            result = int(PyBytes_FromStringAndSize(self._buf + self.index,
+                                                   end - self.index))
+        else:
+            result = -value if negative else value
+        self.index = end + 1
+        return result
+
+    cdef object _decode_string(self, bint as_bytes):
+        cdef Py_ssize_t separator = self._find(b':')
+        cdef Py_ssize_t length = 0
+        cdef Py_ssize_t start, i
+        cdef char c
+        for i in range(self.index, separator):
+            c = self._buf[i]
+            if not b'0' <= c <= b'9':
+                raise ValueError('Invalid string length read at {0}'.format(
+                    str(self.index)))
+            # Past the size of the data the length can only be rejected,
+            # but the rest of its digits are still validated
+            if length <= self._length:
+                length = length * 10 + (c - 48)
+        start = separator + 1
+        if length > self._length - start:
+            raise IndexError('Cannot read {0} bytes from current position {1}'
+                             .format(str(length), str(start)))
+        self.index = start + length
+        if as_bytes:
+            return PyBytes_FromStringAndSize(self._buf + start, length)
+        return self._view[start:start + length]
+
+
+def decode_bytes(bytes data not None):
+    """
+    Decode the bencoded `data` and return the matching python object.
+    """
+    return CDecoder(data).decode()
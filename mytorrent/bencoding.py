@@ -1,17 +1,37 @@
 from collections import OrderedDict
 
+from .tokens import (
+    TOKEN_DICT_D,
+    TOKEN_END_E,
+    TOKEN_INTEGER_I,
+    TOKEN_LIST_L,
+    Token,
+)
 
-from .tokens import Token
+try:
+    from ._bencode import CDecoder
+except ImportError:  # The compiled decoder is optional
+    CDecoder = None
+
+# Lookup table of the byte values that are ASCII digits, which start the
+# length prefix of a string
+_IS_DIGIT = bytes(1 if 0x30 <= b <= 0x39 else 0 for b in range(256))
 
 
 class Decoder:
     """
     Decodes a bencoded sequence of bytes.
+
+    Strings are returned as `memoryview` slices of the input data rather than
+    copies, with the exception of dict keys which are returned as `bytes`.
     """
     def __init__(self, data: bytes):
         if not isinstance(data, bytes):
             raise TypeError('Argument "data" must be of type bytes')
-        self._data = data
+        # Strings are returned as zero-copy slices of this view, while the
+        # original bytes are kept around for the fast `index` lookups
+        self._data = memoryview(data)
+        self._bytes = data
         self._index = 0
 
     def decode(self):
@@ -20,42 +40,48 @@ class Decoder:
 
         :return A python object representing the bencoded data
         """
-        c = self._peek()
-        match c:
-            case None:
+        if CDecoder is not None:
+            decoder = CDecoder(self._bytes, self._index)
+            res = decoder.decode()
+            self._index = decoder.index
+            return res
+
+        data = self._data
+        length = len(data)
+        builder = _ValueBuilder()
+        add = builder.add
+        while not builder.done:
+            if self._index >= length:
                 raise EOFError('Unexpected end-of-file')
-            case Token.TOKEN_INTEGER:
-                self._consume()  # The token
-                return self._decode_int()
-            case Token.TOKEN_LIST:
-                self._consume()  # The token
-                return self._decode_list()
-            case Token.TOKEN_DICT:
-                self._consume()  # The token
-                return self._decode_dict()
-            case Token.TOKEN_END:
-                return None
-            case item if item in b'01234567899':
-                return self._decode_string()
-            case _:
+            c = data[self._index]
+            if c == TOKEN_INTEGER_I:
+                self._index += 1  # The token
+                add(self._decode_int())
+            elif _IS_DIGIT[c]:
+                add(self._decode_string())
+            elif c == TOKEN_LIST_L:
+                self._index += 1  # The token
+                builder.open([])
+            elif c == TOKEN_DICT_D:
+                self._index += 1  # The token
+                builder.open({})
+            elif c == TOKEN_END_E:
+                self._index += 1  # The END token
+                builder.close()
+            else:
                 raise RuntimeError('Invalid token read at {0}'.format(
                     str(self._index)))
+        return builder.result
 
-    def _peek(self):
+    def _peek(self) -> int:
         """
-        Return the next character from the bencoded data or None
+        Return the next byte from the bencoded data as an int or -1
         """
-        if self._index + 1 >= len(self._data):
-            return None
-        return self._data[self._index:self._index + 1]
+        if self._index >= len(self._data):
+            return -1
+        return self._data[self._index]
 
-    def _consume(self) -> bytes:
-        """
-        Read (and therefore consume) the next character from the data
-        """
-        self._index += 1
-
-    def _read(self, length: int) -> bytes:
+    def _read(self, length: int) -> memoryview:
         """
         Read the `length` number of bytes from data and return the result
         """
@@ -66,46 +92,216 @@ class Decoder:
         self._index += length
         return res
 
-    def _read_until(self, token: bytes) -> bytes:
+    def _read_until(self, token: bytes) -> memoryview:
         """
         Read from the bencoded data until the given token is found and return
         the characters read.
         """
         try:
-            occurrence = self._data.index(token, self._index)
-            result = self._data[self._index:occurrence]
-            self._index = occurrence + 1
-            return result
+            occurrence = self._bytes.index(token, self._index)
         except ValueError:
             raise RuntimeError('Unable to find token {0}'.format(
                 str(token)))
+        result = self._data[self._index:occurrence]
+        self._index = occurrence + 1
+        return result
 
     def _decode_int(self):
-        return int(self._read_until(Token.TOKEN_END))
-
-    def _decode_list(self):
-        res = []
-        # Recursive decode the content of the list
-        while self._data[self._index: self._index + 1] != Token.TOKEN_END:
-            res.append(self.decode())
-        self._consume()  # The END token
-        return res
+        return int(bytes(self._read_until(Token.TOKEN_END)))
 
-    def _decode_dict(self):
-        res = OrderedDict()
-        while self._data[self._index: self._index + 1] != Token.TOKEN_END:
-            key = self.decode()
-            obj = self.decode()
-            res[key] = obj
-        self._consume()  # The END token
-        return res
-
-    def _decode_string(self):
-        bytes_to_read = int(self._read_until(Token.TOKEN_STRING_SEPARATOR))
+    def _decode_string(self) -> memoryview:
+        start = self._index
+        length = bytes(self._read_until(Token.TOKEN_STRING_SEPARATOR))
+        # int() would also accept signs, spaces and underscores
+        if not length.isdigit():
+            raise ValueError('Invalid string length read at {0}'.format(
+                str(start)))
+        bytes_to_read = int(length)
         data = self._read(bytes_to_read)
         return data
 
 
+class StreamDecoder:
+    """
+    Decodes a bencoded sequence of bytes that is received in chunks.
+
+    Every complete token is decoded as soon as it has been fed, so only the
+    start of a token that is still being received is buffered. A string that
+    is longer than the data received so far is copied straight into a buffer
+    of its own as the rest of it arrives.
+
+    When the total size of the data is known, `limit` rejects strings that
+    claim to be longer than what is left of it.
+
+    Like the `Decoder`, strings are returned as `memoryview` and dict keys
+    as `bytes`.
+    """
+    def __init__(self, limit: int | None = None) -> None:
+        self._buffer = bytearray()
+        self._builder = _ValueBuilder()
+        self._limit = limit
+        # The position of the start of the buffer in the data
+        self._position = 0
+        # The string being received, which grows up to `_string_size` bytes
+        # as the data arrives rather than trusting its length prefix
+        self._string: bytearray | None = None
+        self._string_size = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Decode as much as possible of the data received so far. Any data
+        after the end of the bencoded value is ignored.
+        """
+        if self._builder.done:
+            return
+        chunk = memoryview(chunk)
+        if self._string is not None:
+            chunk = self._receive_string(chunk)
+            if self._string is not None or self._builder.done:
+                return
+        self._buffer += chunk
+        self._decode_buffer()
+
+    def result(self):
+        """
+        Return the python object matching the data fed to the decoder.
+        """
+        if not self._builder.done:
+            raise EOFError('Unexpected end-of-file')
+        return self._builder.result
+
+    def _receive_string(self, chunk: memoryview) -> memoryview:
+        """
+        Copy the start of `chunk` into the string being received and return
+        what is left of the chunk.
+        """
+        string = self._string
+        count = min(self._string_size - len(string), len(chunk))
+        string += chunk[:count]
+        self._position += count
+        if len(string) == self._string_size:
+            self._string = None
+            self._builder.add(memoryview(string).toreadonly())
+        return chunk[count:]
+
+    def _decode_buffer(self) -> None:
+        buf = self._buffer
+        builder = self._builder
+        length = len(buf)
+        index = 0
+        # The view must be released before the buffer can be resized
+        with memoryview(buf) as view:
+            while index < length and not builder.done:
+                c = buf[index]
+                if c == TOKEN_INTEGER_I:
+                    end = buf.find(Token.TOKEN_END, index + 1)
+                    if end == -1:
+                        break  # Wait for the rest of the integer
+                    builder.add(int(view[index + 1:end]))
+                    index = end + 1
+                elif _IS_DIGIT[c]:
+                    separator = buf.find(Token.TOKEN_STRING_SEPARATOR, index)
+                    if separator == -1:
+                        break  # Wait for the rest of the length
+                    size = buf[index:separator]
+                    if not size.isdigit():
+                        raise ValueError('Invalid string length read')
+                    size = int(size)
+                    start = separator + 1
+                    if start + size > length:
+                        position = self._position + start
+                        if (self._limit is not None
+                                and position + size > self._limit):
+                            raise IndexError(
+                                'Cannot read {0} bytes from current position '
+                                '{1}'.format(str(size), str(position)))
+                        # Receive the rest of the string in its own buffer
+                        self._string = bytearray(view[start:])
+                        self._string_size = size
+                        index = length
+                        break
+                    index = start + size
+                    builder.add(memoryview(bytes(view[start:index])))
+                elif c == TOKEN_LIST_L:
+                    index += 1  # The token
+                    builder.open([])
+                elif c == TOKEN_DICT_D:
+                    index += 1  # The token
+                    builder.open({})
+                elif c == TOKEN_END_E:
+                    index += 1  # The END token
+                    builder.close()
+                else:
+                    raise RuntimeError('Invalid token read')
+        # Drop the decoded data, keeping only an incomplete token
+        del buf[:index]
+        self._position += index
+
+
+class _ValueBuilder:
+    """
+    Assembles decoded values into the lists and dicts that contain them, for
+    the decoders that read the tokens.
+
+    Nested lists and dicts are kept on an explicit stack rather than using
+    recursion, so the depth of the data is not bound by the recursion limit.
+    """
+    def __init__(self) -> None:
+        # The lists and dicts currently being decoded, innermost last, and
+        # for each of them the dict key that is waiting for its value
+        self.stack = []
+        self.keys = []
+        self.result = None
+        self.done = False
+
+    def open(self, container: list | dict) -> None:
+        """
+        Start decoding the items of a list or dict
+        """
+        self.stack.append(container)
+        self.keys.append(None)
+
+    def close(self) -> None:
+        """
+        End the innermost list or dict, which is added to its own container.
+        An END token outside of any list or dict decodes to None.
+        """
+        if not self.stack:
+            self.add(None)
+            return
+        if self.keys[-1] is not None:
+            raise EOFError('Unexpected end of dict, missing value '
+                           'for key {0}'.format(str(self.keys[-1])))
+        self.keys.pop()
+        self.add(self.stack.pop())
+
+    def add(self, obj) -> None:
+        """
+        Add a decoded value to the innermost list or dict, or make it the
+        result if it is not contained in any.
+        """
+        stack = self.stack
+        if not stack:
+            self.result = obj
+            self.done = True
+            return
+        container = stack[-1]
+        if type(container) is list:
+            container.append(obj)
+            return
+        keys = self.keys
+        key = keys[-1]
+        if key is not None:
+            container[key] = obj
+            keys[-1] = None
+        elif type(obj) is memoryview:
+            # Keys must be hashable, so they are the only strings copied
+            keys[-1] = bytes(obj)
+        else:
+            raise RuntimeError('Invalid dict key of type {0}'.format(
+                str(type(obj))))
+
+
 class Encoder:
     """
     Encodes a python object to a bencoded sequence of bytes.
@@ -116,10 +312,11 @@ class Encoder:
         - list
         - dict
         - bytes
+        - memoryview (as returned by the Decoder)
 
     Any other type will simply be ignored.
     """
-    def __init__(self, data: str | int | list | dict | OrderedDict | bytes) -> None:
+    def __init__(self, data: str | int | list | dict | bytes | memoryview) -> None:
         self._data = data
 
     def encode(self) -> bytes:
@@ -128,55 +325,66 @@ class Encoder:
 
         :return The bencoded binary data
         """
-        return self.encode_next(self._data)
-
-    def encode_next(self, data: str | int | list | dict | OrderedDict | bytes) -> bytes:
-        match data:
-            case str():
-                return self._encode_string(data)
-            case int():
-                return self._encode_int(data)
-            case list():
-                return self._encode_list(data)
-            case dict() | OrderedDict():
-                return self._encode_dict(data)
-            case bytes():
-                return self._encode_bytes(data)
-            case _:
+        buf = bytearray()
+        self._encode_into(self._data, buf)
+        return bytes(buf)
+
+    def encode_next(self, data: str | int | list | dict | bytes | memoryview) -> bytes:
+        buf = bytearray()
+        self._encode_into(data, buf)
+        return bytes(buf)
+
+    def _encode_into(self, data: str | int | list | dict | bytes | memoryview,
+                     buf: bytearray) -> None:
+        """
+        Encode a python object by appending it to the shared `buf`
+        """
+        handler = self._DISPATCH.get(type(data))
+        if handler is None:
+            # Subclasses of the supported types
+            for kind, kind_handler in self._DISPATCH.items():
+                if isinstance(data, kind):
+                    handler = kind_handler
+                    break
+            else:
                 error_msg = f"Cannot bencode {type(data)}"
                 raise TypeError(error_msg)
-                return None
+        handler(self, data, buf)
 
-    def _encode_int(self, value: int) -> bytes:
-        return str.encode('i' + str(value) + 'e')
+    def _encode_int(self, value: int, buf: bytearray) -> None:
+        buf += b'i%de' % value
 
-    def _encode_string(self, value: str) -> bytes:
-        res = str(len(value)) + ':' + value
-        return str.encode(res)
+    def _encode_string(self, value: str, buf: bytearray) -> None:
+        # The length prefix is the number of bytes, not characters
+        encoded = value.encode('utf-8')
+        buf += b'%d:' % len(encoded)
+        buf += encoded
 
-    def _encode_bytes(self, value: bytes) -> bytes:
-        result = bytearray()
-        result += str.encode(str(len(value)))
-        result += b':'
-        result += value
-        return result
+    def _encode_bytes(self, value: bytes | memoryview, buf: bytearray) -> None:
+        buf += b'%d:' % len(value)
+        buf += value
 
-    def _encode_list(self,  data: list) -> bytes:
-        result = bytearray('l', 'utf-8')
-        result += b''.join([self.encode_next(item) for item in data])
-        result += b'e'
-        return result
+    def _encode_list(self, data: list, buf: bytearray) -> None:
+        buf += b'l'
+        for item in data:
+            self._encode_into(item, buf)
+        buf += b'e'
 
-    def _encode_dict(self, data: dict) -> bytes:
-        result = bytearray('d', 'utf-8')
+    def _encode_dict(self, data: dict, buf: bytearray) -> None:
+        buf += b'd'
         for k, v in data.items():
-            key = self.encode_next(k)
-            value = self.encode_next(v)
-            if key and value:
-                result += key
-                result += value
-            else:
-                msg = "Bad dict"
-                raise RuntimeError(msg)
-        result += b'e'
-        return result
\ No newline at end of file
+            self._encode_into(k, buf)
+            self._encode_into(v, buf)
+        buf += b'e'
+
+    # The encoding method for each supported type, looked up by exact type
+    _DISPATCH = {
+        bytes: _encode_bytes,
+        str: _encode_string,
+        int: _encode_int,
+        list: _encode_list,
+        dict: _encode_dict,
+        memoryview: _encode_bytes,
+        bool: _encode_int,
+        OrderedDict: _encode_dict,
+    }
@@ -1,21 +1,22 @@
 import unittest
 from collections import OrderedDict
 
-from bencoding import Decoder, Encoder
+import bencoding
+from bencoding import Decoder, Encoder, StreamDecoder
 
 
 class DecodingTests(unittest.TestCase):
     def test_peek_iis_idempotent(self):
         decoder = Decoder(b'12')
 
-        self.assertEqual(b'1', decoder._peek())
-        self.assertEqual(b'1', decoder._peek())
+        self.assertEqual(ord('1'), decoder._peek())
+        self.assertEqual(ord('1'), decoder._peek())
 
     def test_peek_should_handle_end(self):
         decoder = Decoder(b'1')
         decoder._index = 1
 
-        self.assertEqual(None, decoder._peek())
+        self.assertEqual(-1, decoder._peek())
 
     def test_read_until_found(self):
         decoder = Decoder(b'123456')
@@ -28,6 +29,20 @@ class DecodingTests(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             decoder._read_until(b'7')
 
+    def test_read_until_consecutive_tokens(self):
+        decoder = Decoder(b'12:3e45:6e')
+
+        self.assertEqual(b'12', decoder._read_until(b':'))
+        self.assertEqual(b'3', decoder._read_until(b'e'))
+        self.assertEqual(b'45', decoder._read_until(b':'))
+
+    def test_read_until_not_found_after_index(self):
+        decoder = Decoder(b'123e456')
+        decoder._index = 4
+
+        with self.assertRaises(RuntimeError):
+            decoder._read_until(b'e')
+
     def test_empty_string(self):
         with self.assertRaises(EOFError):
             Decoder(b'').decode()
@@ -43,6 +58,11 @@ class DecodingTests(unittest.TestCase):
 
         self.assertEqual(int(res), 123)
 
+    def test_integer_without_digits(self):
+        for data in (b'ie', b'i-e'):
+            with self.assertRaises(ValueError):
+                Decoder(data).decode()
+
     def test_string(self):
         res = Decoder(b'4:name').decode()
 
@@ -58,6 +78,11 @@ class DecodingTests(unittest.TestCase):
 
         self.assertEqual(res, b'Middle Earth')
 
+    def test_string_length_not_digits(self):
+        for data in (b'1_0:abcdefghij', b'1 :a', b'38x77:4a'):
+            with self.assertRaises(ValueError):
+                Decoder(data).decode()
+
     def test_list(self):
         res = Decoder(b'l4:spam4:eggsi123ee').decode()
 
@@ -73,11 +98,106 @@ class DecodingTests(unittest.TestCase):
         self.assertEqual(res[b'cow'], b'moo')
         self.assertEqual(res[b'spam'], b'eggs')
 
+    def test_string_is_zero_copy(self):
+        res = Decoder(b'4:name').decode()
+
+        self.assertIsInstance(res, memoryview)
+
+    def test_dict_keys_are_bytes(self):
+        res = Decoder(b'd3:cow3:mooe').decode()
+
+        self.assertEqual([b'cow'], list(res.keys()))
+        self.assertIsInstance(next(iter(res)), bytes)
+
+    def test_nested_structure(self):
+        res = Decoder(b'd1:ad2:bali1eleee1:cl1:dee').decode()
+
+        self.assertEqual([1, []], res[b'a'][b'ba'])
+        self.assertEqual([b'd'], res[b'c'])
+
+    def test_deeply_nested_list(self):
+        depth = 10000
+        res = Decoder(b'l' * depth + b'e' * depth).decode()
+
+        for _ in range(depth - 1):
+            res = res[0]
+        self.assertEqual([], res)
+
+    def test_non_string_key_in_dict_should_failed(self):
+        with self.assertRaises(RuntimeError):
+            Decoder(b'di1e3:mooe').decode()
+
+    def test_unterminated_list_as_dict_key(self):
+        with self.assertRaises(EOFError):
+            Decoder(b'dl').decode()
+
     def test_malformed_key_in_dict_should_failed(self):
         with self.assertRaises(EOFError):
             Decoder(b'd3:moo4:spam4:eggse').decode()
 
 
+class PythonDecodingTests(DecodingTests):
+    """
+    Runs the decoding tests against the pure python decoder, which is
+    otherwise bypassed when the compiled decoder has been built.
+    """
+    def setUp(self):
+        self._compiled_decoder = bencoding.CDecoder
+        bencoding.CDecoder = None
+
+    def tearDown(self):
+        bencoding.CDecoder = self._compiled_decoder
+
+
+class StreamDecodingTests(unittest.TestCase):
+    def test_chunked_dict(self):
+        data = b'd3:cowli123e3:mooe4:spam4:eggse'
+        decoder = StreamDecoder()
+        for i in range(len(data)):
+            decoder.feed(data[i:i + 1])
+
+        res = decoder.result()
+        self.assertEqual([123, b'moo'], res[b'cow'])
+        self.assertEqual(b'eggs', res[b'spam'])
+
+    def test_decoded_data_is_released(self):
+        decoder = StreamDecoder()
+        decoder.feed(b'l4:spam12')
+
+        self.assertEqual(b'12', decoder._buffer)
+
+    def test_long_string_is_received_in_own_buffer(self):
+        decoder = StreamDecoder()
+        decoder.feed(b'l4:spam5:eg')
+
+        self.assertEqual(b'', decoder._buffer)
+        decoder.feed(b'gs')
+        decoder.feed(b'!e')
+        res = decoder.result()
+        self.assertEqual([b'spam', b'eggs!'], res)
+        self.assertTrue(res[1].readonly)
+
+    def test_string_longer_than_limit(self):
+        data = b'd5:peers1500000000:'
+        decoder = StreamDecoder(len(data) + 100)
+
+        with self.assertRaises(IndexError):
+            decoder.feed(data)
+
+    def test_long_string_is_not_preallocated(self):
+        decoder = StreamDecoder()
+        decoder.feed(b'd5:peers1500000000:ab')
+
+        self.assertEqual(b'ab', decoder._string)
+
+    def test_incomplete_data(self):
+        decoder = StreamDecoder()
+        decoder.feed(b'l4:spam')
+
+        with self.assertRaises(EOFError):
+            decoder.result()
+
+
 class EncodingTests(unittest.TestCase):
     def test_empty_encoding(self):
         res = Encoder(None).encode()
@@ -89,11 +209,38 @@ class EncodingTests(unittest.TestCase):
 
         self.assertEqual(b'i123e', res)
 
+    def test_bool_as_integer(self):
+        res = Encoder([True, False]).encode()
+
+        self.assertEqual(b'li1ei0ee', res)
+
+    def test_subclass_of_supported_type(self):
+        class Name(str):
+            pass
+
+        res = Encoder([Name('spam'), Name('eggs')]).encode()
+
+        self.assertEqual(b'l4:spam4:eggse', res)
+
+    def test_unsupported_type(self):
+        with self.assertRaises(TypeError):
+            Encoder(1.5).encode()
+
     def test_string(self):
         res = Encoder('Middle Earth').encode()
 
         self.assertEqual(b'12:Middle Earth', res)
 
+    def test_non_ascii_string(self):
+        res = Encoder('Mörk').encode()
+
+        self.assertEqual(b'5:M\xc3\xb6rk', res)
+
+    def test_bytes(self):
+        res = Encoder(b'\x00\xff').encode()
+
+        self.assertEqual(b'2:\x00\xff', res)
+
     def test_list(self):
         res = Encoder(['spam', 'eggs', 123]).encode()
 
@@ -108,6 +255,12 @@ class EncodingTests(unittest.TestCase):
 
         self.assertEqual(b'd3:cow3:moo4:spam4:eggse', res)
 
+    def test_round_trip_decoded_data(self):
+        data = b'd4:infod6:lengthi42e6:pieces3:abcee'
+        res = Encoder(Decoder(data).decode()).encode()
+
+        self.assertEqual(data, bytes(res))
+
     def test_nested_structure(self):
         outer = OrderedDict()
         b = OrderedDict()
@@ -1,7 +1,19 @@
+import asyncio
 import unittest
 from collections import OrderedDict
+from types import SimpleNamespace
 
-from tracker import _calculate_peer_id, TrackerResponse
+import aiohttp
+
+from tracker import _calculate_peer_id, Tracker, TrackerResponse
+
+
+def make_torrent():
+    return SimpleNamespace(
+        announce='http://tracker.example/announce',
+        info_hash=b'\x00\x12 4V/x\x9a\xbc\xde\xf0\x12 4V/x\x9a\xbc\xde',
+        total_size=1000,
+    )
 
 
 class TrackerTests(unittest.TestCase):
@@ -10,6 +22,131 @@ class TrackerTests(unittest.TestCase):
 
         self.assertTrue(len(peer_id) == 20)
 
+    def test_peer_id_random_part_is_digits(self):
+        peer_id = _calculate_peer_id()
+
+        self.assertTrue(peer_id.startswith(b'-PC0001-'))
+        self.assertTrue(peer_id[8:].isdigit())
+
+    def test_raise_for_error_on_failure(self):
+        with self.assertRaises(ConnectionError):
+            Tracker.raise_for_error(b'd14:failure reason11:You failed!e')
+
+    def test_raise_for_error_on_success(self):
+        Tracker.raise_for_error(
+            b'd8:completei5e5:peers6:\xff\xfe\x01\x02\x1a\xe1e')
+
+
+class AnnounceUrlTests(unittest.TestCase):
+    def setUp(self):
+        self.tracker = Tracker(make_torrent())
+        # The info hash has spaces and slashes, which are percent-encoded
+        self.prefix = (
+            'http://tracker.example/announce'
+            '?info_hash=%00%12%204V%2Fx%9A%BC%DE%F0%12%204V%2Fx%9A%BC%DE'
+            '&peer_id=' + self.tracker.peer_id.decode()
+            + '&port=6889&compact=1'
+        )
+
+    def test_announce_url(self):
+        url = self.tracker._announce_url(False, 10, 200, False)
+
+        self.assertEqual(
+            self.prefix + '&uploaded=10&downloaded=200&left=800', url)
+
+    def test_first_announce_url(self):
+        url = self.tracker._announce_url(True, 0, 0, False)
+
+        self.assertEqual(
+            self.prefix + '&uploaded=0&downloaded=0&left=1000'
+            '&event=started', url)
+
+    def test_seeder_announce_url(self):
+        url = self.tracker._announce_url(True, 5, 1000, True)
+
+        self.assertEqual(
+            self.prefix + '&uploaded=5&downloaded=1000&left=0'
+            '&event=completed', url)
+
+
+class StreamedResponseTests(unittest.TestCase):
+    @staticmethod
+    def make_response(data, chunk_size):
+        async def iter_chunked(_):
+            for i in range(0, len(data), chunk_size):
+                yield data[i:i + chunk_size]
+
+        # Announced as large enough to be decoded while it is received
+        return SimpleNamespace(
+            content_length=10 ** 6,
+            content=SimpleNamespace(iter_chunked=iter_chunked),
+        )
+
+    def decode(self, data, chunk_size=7):
+        tracker = Tracker(make_torrent())
+        response = self.make_response(data, chunk_size)
+        return asyncio.run(tracker._decode_response(response))
+
+    def test_streamed_response(self):
+        peers = bytes(range(60))
+        res = self.decode(b'd8:intervali1800e5:peers60:' + peers + b'e')
+
+        self.assertEqual(1800, res[b'interval'])
+        self.assertEqual(10, len(TrackerResponse(res).peers))
+
+    def test_streamed_failure_in_short_chunks(self):
+        with self.assertRaises(ConnectionError):
+            self.decode(b'd14:failure reason11:You failed!e', chunk_size=4)
+
+
+class TrackerSessionTests(unittest.TestCase):
+    def test_trackers_share_session(self):
+        async def run():
+            first = Tracker(make_torrent())
+            second = Tracker(make_torrent())
+            session = first.http_client
+
+            self.assertIs(session, second.http_client)
+            await first.close()
+            self.assertFalse(session.closed)
+            await second.close()
+            self.assertTrue(session.closed)
+
+        asyncio.run(run())
+
+    def test_given_session_is_left_open(self):
+        async def run():
+            session = aiohttp.ClientSession()
+            tracker = Tracker(make_torrent(), session)
+
+            self.assertIs(session, tracker.http_client)
+            await tracker.close()
+            self.assertFalse(session.closed)
+            await session.close()
+
+        asyncio.run(run())
+
+    def test_shared_session_per_event_loop(self):
+        tracker = Tracker(make_torrent())
+
+        async def first_run():
+            session = tracker.http_client
+            # Closed behind the back of the tracker, as the loop ends
+            await session.close()
+            return session
+
+        async def second_run():
+            session = tracker.http_client
+            self.assertFalse(session.closed)
+            await tracker.close()
+            return session
+
+        first = asyncio.run(first_run())
+        second = asyncio.run(second_run())
+
+        self.assertIsNot(first, second)
+        self.assertTrue(second.closed)
+
 
 class TrackerResponseTest(unittest.TestCase):
     def setUp(self):
@@ -48,4 +185,17 @@ class TrackerResponseTest(unittest.TestCase):
     def test_successful_response_peer_string(self):
         response = TrackerResponse(self.ok_response)
 
-        self.assertEqual(50, len(response.peers))
\ No newline at end of file
+        self.assertEqual(50, len(response.peers))
+
+    def test_successful_response_peer_address(self):
+        response = TrackerResponse(self.ok_response)
+
+        self.assertEqual(('86.4.24.115', 51419), response.peers[0])
+
+    def test_successful_response_peer_iteration(self):
+        response = TrackerResponse(self.ok_response)
+        peers = list(response.peers)
+
+        self.assertEqual(50, len(peers))
+        self.assertEqual(response.peers[-1], peers[-1])
+        self.assertEqual(('86.4.24.115', 51419), peers[0])
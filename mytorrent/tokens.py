@@ -12,4 +12,12 @@ class Token:
     TOKEN_END = b'e'
 
     # Delimits string length from string data
-    TOKEN_STRING_SEPARATOR = b':'
\ No newline at end of file
+    TOKEN_STRING_SEPARATOR = b':'
+
+
+# Integer byte values of the tokens above, used by the decoder to dispatch on
+# a single indexed byte without creating a bytes object
+TOKEN_INTEGER_I = ord(Token.TOKEN_INTEGER)
+TOKEN_LIST_L = ord(Token.TOKEN_LIST)
+TOKEN_DICT_D = ord(Token.TOKEN_DICT)
+TOKEN_END_E = ord(Token.TOKEN_END)
@@ -1,9 +1,10 @@
+import asyncio
 import logging
-import random
+import os
 import socket
-from struct import unpack
-from typing import cast
-from urllib.parse import urlencode
+import struct
+from collections.abc import Iterator, Sequence
+from urllib.parse import quote_from_bytes
 
 import aiohttp
 
@@ -11,6 +12,27 @@ from torrent import Torrent
 
 from . import bencoding
 
+# A compact peer is 6 bytes: the IPv4 address followed by a big-endian port
+_PEER_STRUCT = struct.Struct(">4sH")
+
+# Maps every byte value to an ASCII digit, used to turn random bytes into the
+# random characters of the peer id
+_DIGIT_TABLE = bytes(0x30 + b % 10 for b in range(256))
+
+# Tracker responses larger than this are decoded while they are received
+_STREAM_THRESHOLD = 64 * 1024
+_STREAM_CHUNK_SIZE = 8192
+
+# How much of the start of a streamed response is checked for an error
+_ERROR_PREFIX_SIZE = 512
+
+# The HTTP session shared by the trackers that are not given one, for each
+# event loop, so that connections and DNS lookups are reused across announces
+# and torrents. The number of open trackers using each session is kept so it
+# can be closed along with the last of them.
+_shared_sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+_shared_session_users: dict[asyncio.AbstractEventLoop, int] = {}
+
 
 class TrackerResponse:
     """The response from the tracker after a successful connection to the
@@ -32,7 +54,7 @@ class TrackerResponse:
         If no error occurred this will be None
         """
         if b"failure reason" in self.response:
-            res = self.response[b"failure reason"].decode("utf-8")
+            res = bytes(self.response[b"failure reason"]).decode("utf-8")
             if isinstance(res, str):
                 return res
         return None
@@ -67,8 +89,8 @@ class TrackerResponse:
         return res
 
     @property
-    def peers(self) -> list[tuple[str, int]]:
-        """A list of tuples for each peer structured as (ip, port)"""
+    def peers(self) -> "_PeerView":
+        """A sequence of tuples for each peer structured as (ip, port)"""
         # The BitTorrent specification specifies two types of responses. One
         # where the peers field is a list of dictionaries and one where all
         # the peers are encoded in a single string
@@ -80,12 +102,7 @@ class TrackerResponse:
 
         logging.debug("Binary model peers are returned by tracker")
 
-        # Split the string in pieces of length 6 bytes, where the first
-        # 4 characters is the IP the last 2 is the TCP port.
-        peers = [peers[i : i + 6] for i in range(0, len(peers), 6)]
-
-        # Convert the encoded address to a list of tuples
-        return [(socket.inet_ntoa(p[:4]), _decode_port(p[4:])) for p in peers]
+        return _PeerView(peers)
 
     def __str__(self) -> str:
         return (
@@ -101,10 +118,44 @@ class Tracker:
     under download or seeding state.
     """
 
-    def __init__(self, torrent: Torrent) -> None:
+    def __init__(
+        self,
+        torrent: Torrent,
+        session: aiohttp.ClientSession | None = None,
+    ) -> None:
         self.torrent: Torrent = torrent
         self.peer_id: bytes = _calculate_peer_id()
-        self.http_client: aiohttp.ClientSession = aiohttp.ClientSession()
+        self._session: aiohttp.ClientSession | None = session
+        self._shared_session: aiohttp.ClientSession | None = None
+        # The parameters that never change during the lifetime of the tracker
+        # are url-encoded once, only the statistics are added per announce
+        self._encoded_info_hash: str = quote_from_bytes(
+            self.torrent.info_hash,
+            safe="",
+        )
+        self._encoded_peer_id: str = quote_from_bytes(self.peer_id, safe="")
+        self._url_prefix: str = (
+            f"{self.torrent.announce}"
+            f"?info_hash={self._encoded_info_hash}"
+            f"&peer_id={self._encoded_peer_id}"
+            "&port=6889"
+            "&compact=1"
+        )
+        self._total_size: int = self.torrent.total_size
+
+    @property
+    def http_client(self) -> aiohttp.ClientSession:
+        """The session given when creating the tracker, otherwise the session
+        shared by the trackers of the running event loop.
+        """
+        if self._session is not None:
+            return self._session
+        shared = self._shared_session
+        if shared is None or shared is not _shared_sessions.get(
+            asyncio.get_running_loop(),
+        ):
+            self._shared_session = _acquire_shared_session()
+        return self._shared_session
 
     async def connect(
         self,
@@ -123,57 +174,96 @@ class Tracker:
         :param uploaded: The total number of bytes uploaded
         :param downloaded: The total number of bytes downloaded
         """
-        params = {
-            "info_hash": self.torrent.info_hash,
-            "peer_id": self.peer_id,
-            "port": 6889,
-            "uploaded": uploaded,
-            "downloaded": downloaded,
-            "left": self.torrent.total_size - downloaded,
-            "compact": 1,
-        }
-        if first:
-            params["event"] = "started"
-
-        if seeder:
-            params["event"] = "completed"
-
-        url = self.torrent.announce + "?" + urlencode(params)
+        url = self._announce_url(first, uploaded, downloaded, seeder)
         logging.info("Connecting to tracker at: %s", url)
 
         async with self.http_client.get(url) as response:
             if response.status != 200:  # noqa: PLR2004
                 msg = f"Unable to connect to tracker: status code {response.status}"
                 raise ConnectionError(msg)
-            data = await response.read()
-            self.raise_for_error(data)
-
-            decoded = bencoding.Decoder(data).decode()
+            decoded = await self._decode_response(response)
             if not isinstance(decoded, dict):
                 msg = "Tracker response is not a dict"
                 raise TypeError(msg)
             return TrackerResponse(decoded)
 
+    def _announce_url(
+        self,
+        first: bool,  # noqa: FBT001
+        uploaded: int,
+        downloaded: int,
+        seeder: bool,  # noqa: FBT001
+    ) -> str:
+        """Builds the URL of the announce call from the precomputed prefix and
+        the current statistics.
+        """
+        # All the remaining parameters are integers or ASCII constants, so
+        # they are safe to append without url-encoding
+        left = self._total_size - downloaded
+        url = (
+            f"{self._url_prefix}"
+            f"&uploaded={uploaded}"
+            f"&downloaded={downloaded}"
+            f"&left={left}"
+        )
+        if seeder:
+            url += "&event=completed"
+        elif first:
+            url += "&event=started"
+        return url
+
+    async def _decode_response(
+        self,
+        response: aiohttp.ClientResponse,
+    ) -> object:
+        """Reads and decodes the bencoded body of the tracker response.
+
+        Large responses are decoded while they are being received rather than
+        after buffering the whole body.
+        """
+        if (response.content_length or 0) <= _STREAM_THRESHOLD:
+            data = await response.read()
+            self.raise_for_error(data)
+            return bencoding.Decoder(data).decode()
+
+        decoder = bencoding.StreamDecoder(response.content_length)
+        # The start of the response is kept to check it for an error, as
+        # the first chunks may be shorter than what the check looks at
+        head: bytearray | None = bytearray()
+        async for chunk in response.content.iter_chunked(_STREAM_CHUNK_SIZE):
+            if head is not None:
+                head += chunk[: _ERROR_PREFIX_SIZE - len(head)]
+                if len(head) == _ERROR_PREFIX_SIZE:
+                    self.raise_for_error(bytes(head))
+                    head = None
+            decoder.feed(chunk)
+        if head is not None:
+            self.raise_for_error(bytes(head))
+        return decoder.result()
+
     async def close(self) -> None:
-        await self.http_client.close()
+        """Stops using the shared session, which is closed once every tracker
+        using it has been closed. A session given to the tracker is left open
+        for its owner to close.
+        """
+        if self._shared_session is not None:
+            session, self._shared_session = self._shared_session, None
+            await _release_shared_session(session)
 
-    def raise_for_error(self, tracker_response: bytes) -> None:
+    @staticmethod
+    def raise_for_error(tracker_response: bytes) -> None:
         """
         A (hacky) fix to detect errors by tracker even when the response
         has a status code of 200
         """
-        try:
-            # a tracker response containing an error will have a utf-8 message only.
-            # see: https://wiki.theory.org/index.php/BitTorrentSpecification#Tracker_Response
-            message = tracker_response.decode("utf-8")
-            if "failure" in message:
-                msg = f"Unable to connect to tracker: {message}"
-                raise ConnectionError(msg)
-
-        # a successful tracker response will have non-uncicode data,
-        # so it's a safe to bet ignore this exception.
-        except UnicodeDecodeError:
-            pass
+        # a tracker response containing an error is a bencoded dict where
+        # `failure reason` is the only key, so it is found at the very start
+        # of the response and only an error is ever decoded.
+        # see: https://wiki.theory.org/index.php/BitTorrentSpecification#Tracker_Response
+        if b"failure reason" in tracker_response[:128]:
+            message = tracker_response[:512].decode("utf-8", errors="replace")
+            msg = f"Unable to connect to tracker: {message}"
+            raise ConnectionError(msg)
 
     # def _construct_tracker_parameters(self) -> dict:
     #     """Constructs the URL parameters used when issuing the announce call
@@ -191,6 +281,60 @@ class Tracker:
     #     }
 
 
+def _acquire_shared_session() -> aiohttp.ClientSession:
+    """Return the session shared by the trackers of the running event loop,
+    creating it on first use, and count the calling tracker as one of its
+    users.
+
+    Its connector keeps connections to trackers alive between announces and
+    caches DNS lookups.
+    """
+    # Sessions bound to a closed event loop can neither be used nor closed
+    for loop in [loop for loop in _shared_sessions if loop.is_closed()]:
+        del _shared_sessions[loop]
+        del _shared_session_users[loop]
+
+    loop = asyncio.get_running_loop()
+    session = _shared_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                ttl_dns_cache=600,
+                keepalive_timeout=75,
+            ),
+        )
+        _shared_sessions[loop] = session
+        _shared_session_users[loop] = 0
+    _shared_session_users[loop] += 1
+    return session
+
+
+async def _release_shared_session(session: aiohttp.ClientSession) -> None:
+    """Stop counting a tracker as a user of the shared `session`, closing it
+    when no open tracker uses it anymore.
+    """
+    loop = asyncio.get_running_loop()
+    if _shared_sessions.get(loop) is not session:
+        return  # Already closed, or from another event loop
+    _shared_session_users[loop] -= 1
+    if _shared_session_users[loop] == 0:
+        del _shared_sessions[loop]
+        del _shared_session_users[loop]
+        await session.close()
+
+
+async def close_shared_session() -> None:
+    """Close the session shared by the trackers of the running event loop,
+    if it was created. Trackers still open will create a new one when used.
+    """
+    loop = asyncio.get_running_loop()
+    session = _shared_sessions.pop(loop, None)
+    _shared_session_users.pop(loop, None)
+    if session is not None:
+        await session.close()
+
+
 def _calculate_peer_id() -> bytes:
     """Calculate and return a unique Peer ID.
 
@@ -200,13 +344,37 @@ def _calculate_peer_id() -> bytes:
     Read more:
         https://wiki.theory.org/BitTorrentSpecification#peer_id
     """
-    return str.encode(
-        "-PC0001-"
-        + "".join([str(random.randint(0, 9)) for _ in range(12)]),  # noqa: S311
-    )
+    return b"-PC0001-" + os.urandom(12).translate(_DIGIT_TABLE)
 
 
-def _decode_port(port: bytes) -> int:
-    """Converts a 32-bit packed binary port number to int"""
-    # Convert from C style big-endian encoded as unsigned short
-    return cast(int, unpack(">H", port)[0])
\ No newline at end of file
+class _PeerView(Sequence):
+    """A read-only sequence of (ip, port) tuples over the binary model peers.
+
+    The peers are kept as the compact string returned by the tracker, where
+    each peer is a record of 6 bytes: the first 4 characters is the IP the
+    last 2 is the TCP port. Tuples are only created when a peer is accessed.
+    """
+
+    def __init__(self, blob: bytes) -> None:
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._blob) // 6
+
+    def __getitem__(
+        self,
+        index: int | slice,
+    ) -> tuple[str, int] | list[tuple[str, int]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            msg = "peer index out of range"
+            raise IndexError(msg)
+        ip, port = _PEER_STRUCT.unpack_from(self._blob, index * 6)
+        return socket.inet_ntoa(ip), port
+
+    def __iter__(self) -> Iterator[tuple[str, int]]:
+        for ip, port in _PEER_STRUCT.iter_unpack(self._blob):
+            yield socket.inet_ntoa(ip), port